@@ -5,64 +5,169 @@ import ast
 import json
 import re
 import sys
+import time
 from pathlib import Path
 
 LOG_FILE = Path("/tmp/fallback-hook.log")
 
+# Larger (usually generated) Python content only gets the line-level checks
+MAX_AST_PARSE_CHARS = 500_000
+
+_GRACEFUL_RE = re.compile(r'graceful.{0,10}fallback', re.IGNORECASE)
+
+_log_file = None
+
 def log(msg: str):
-    """Log to file for debugging."""
-    with LOG_FILE.open("a") as f:
-        from datetime import datetime
-        f.write(f"=== {datetime.now()} ===\n{msg}\n")
+    """Log to file for debugging, opening it on first use."""
+    global _log_file
+    if _log_file is None:
+        # Line buffered, so each entry lands even if the hook exits abruptly
+        _log_file = LOG_FILE.open("a", buffering=1)
+    _log_file.write(f"=== {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n{msg}\n")
+
+def describe_exception_type(node: ast.expr | None) -> str:
+    """Render an except clause's type, only using ast.unparse for complex ones."""
+    if node is None:
+        return "bare except"
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        return f"{node.value.id}.{node.attr}"
+    return ast.unparse(node)
+
+class TryFinder(ast.NodeVisitor):
+    """Collect except-pass handlers, descending only into statements.
+
+    Try blocks can only appear in statement bodies, so expression subtrees
+    are never visited.
+    """
+
+    def __init__(self):
+        self.issues = []
+
+    def visit_Try(self, node: ast.Try):
+        for handler in node.handlers:
+            # Check if except body is only 'pass'
+            if len(handler.body) == 1 and isinstance(handler.body[0], ast.Pass):
+                exc_type = describe_exception_type(handler.type)
+                self.issues.append((handler.lineno, f"except {exc_type}: pass"))
+        self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case)):
+                self.visit(child)
 
 def check_try_except_pass(tree: ast.AST) -> list[tuple[int, str]]:
     """Find try-except blocks that only contain 'pass'."""
-    issues = []
+    finder = TryFinder()
+    finder.visit(tree)
+    return finder.issues
+
+def suppresses_errors(code: str) -> bool:
+    """Check for || true or || : (error suppression) with plain string probes."""
+    start = code.find("||")
+    while start != -1:
+        rest = code[start + 2:].lstrip()
+        for word in ("true", ":"):
+            if rest.startswith(word):
+                tail = rest[len(word):]
+                if not tail or tail[0].isspace() or tail[0] == ";":
+                    return True
+        start = code.find("||", start + 1)
+    return False
+
+def scan_lines(content: str, is_bash: bool):
+    """Scan content once, yielding (kind, lineno, desc) for line-level fallbacks.
+
+    Graceful-fallback mentions apply to all languages; '|| true/:' error
+    suppression is only checked for bash.
+    """
+    for i, line in enumerate(content.splitlines(), 1):
+        # Cheap substring tests gate the slower checks; almost no line matches
+        if "fallback" in line.lower() and _GRACEFUL_RE.search(line):
+            yield ("graceful", i, f"Contains 'graceful fallback': {line.strip()}")
+            continue
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Try):
-            for handler in node.handlers:
-                # Check if except body is only 'pass'
-                if len(handler.body) == 1 and isinstance(handler.body[0], ast.Pass):
-                    exc_type = "bare except" if handler.type is None else ast.unparse(handler.type)
-                    issues.append((handler.lineno, f"except {exc_type}: pass"))
+        if not is_bash or "||" not in line:
+            continue
 
-    return issues
+        # Skip comments
+        code_part = line.split('#')[0]
 
-def check_graceful_fallback(content: str) -> list[tuple[int, str]]:
-    """Find mentions of 'graceful fallback' in comments or strings."""
-    pattern = re.compile(r'graceful.{0,10}fallback', re.IGNORECASE)
-    issues = []
+        # Allow rm -f ... || true pattern (cleanup is okay)
+        if 'rm -f' in code_part:
+            continue
 
-    for i, line in enumerate(content.split('\n'), 1):
-        if pattern.search(line):
-            issues.append((i, f"Contains 'graceful fallback': {line.strip()}"))
+        if suppresses_errors(code_part):
+            yield ("bash", i, f"Error suppression with '|| true/:': {line.strip()}")
 
-    return issues
+def find_issue(content: str, filename: str, is_python: bool, is_bash: bool):
+    """Return the first fallback found as (kind, lineno, desc), or None."""
+    # Single pass over the lines; stop at the first line-level issue
+    line_issue = next(scan_lines(content, is_bash), None)
+    if line_issue is not None:
+        return line_issue
 
-def check_bash_fallbacks(content: str) -> list[tuple[int, str]]:
-    """Find bash fallback patterns like || true, || :, etc."""
-    issues = []
+    if is_python and len(content) >= MAX_AST_PARSE_CHARS:
+        log(f"Content of {filename} is {len(content)} chars, skipping AST check")
+        return None
 
-    # Pattern for || true or || : (error suppression)
-    suppress_pattern = re.compile(r'\|\|\s*(true|:)(?:\s|;|$)')
+    # Python-specific checks
+    if is_python:
+        # Parse Python code
+        try:
+            tree = ast.parse(content, filename=filename)
+        except SyntaxError:
+            # If code has syntax errors, let it through - other tools will catch it
+            log(f"Syntax error in {filename}, skipping check")
+            return None
 
-    for i, line in enumerate(content.split('\n'), 1):
-        # Skip comments
-        code_part = line.split('#')[0]
+        # Check for try-except-pass patterns
+        issues = check_try_except_pass(tree)
+        if issues:
+            lineno, desc = issues[0]
+            return ("except-pass", lineno, desc)
 
-        # Allow rm -f ... || true pattern (cleanup is okay)
-        if 'rm -f' in code_part and suppress_pattern.search(code_part):
-            continue
+    return None
+
+def report_issue(issue, filename: str) -> None:
+    """Explain the detected fallback on stderr."""
+    kind, lineno, desc = issue
+    if kind == "graceful":
+        log(f"DETECTED: graceful fallback in {filename}:{lineno}")
+        print(f"""❌ FALLBACK DETECTED in {filename}:{lineno}
+
+Found: {desc}
+
+Core principle: Code should FAIL, not hide errors.
+- No try-except without explicit error handling
+- No graceful fallbacks unless requested
+- Let errors surface immediately
+
+If this fallback is truly needed, ask the user first.""", file=sys.stderr)
+    elif kind == "bash":
+        log(f"DETECTED: bash fallback in {filename}:{lineno}")
+        print(f"""❌ BASH FALLBACK in {filename}:{lineno}
 
-        if suppress_pattern.search(code_part):
-            issues.append((i, f"Error suppression with '|| true/:': {line.strip()}"))
+Found: {desc}
 
-    return issues
+Core principle: Code should FAIL, not hide errors.
+Using || true or || : suppresses errors silently.
+
+If this is truly needed, ask the user first.""", file=sys.stderr)
+    else:
+        log(f"DETECTED: except-pass in {filename}:{lineno}")
+        print(f"""❌ POSSIBLE FALLBACK in {filename}:{lineno}
+
+Found: {desc}
+
+Core principle: Code should FAIL, not hide errors.
+If this is legitimate error handling, make it explicit with logging/re-raising.""", file=sys.stderr)
 
 def main():
-    # Read hook data
-    hook_data = json.load(sys.stdin)
+    # Read hook data as raw bytes; json decodes UTF-8 in one pass
+    hook_data = json.loads(sys.stdin.buffer.read())
 
     tool_name = hook_data.get("tool_name", "unknown")
     log(f"Tool: {tool_name}")
@@ -92,62 +197,11 @@ def main():
         log(f"Skipping non-Python/non-bash file: {filename}")
         sys.exit(0)
 
-    # Check for graceful fallback mentions (applies to all languages)
-    fallback_mentions = check_graceful_fallback(content)
-    if fallback_mentions:
-        lineno, desc = fallback_mentions[0]
-        log(f"DETECTED: graceful fallback in {filename}:{lineno}")
-        print(f"""❌ FALLBACK DETECTED in {filename}:{lineno}
-
-Found: {desc}
-
-Core principle: Code should FAIL, not hide errors.
-- No try-except without explicit error handling
-- No graceful fallbacks unless requested
-- Let errors surface immediately
-
-If this fallback is truly needed, ask the user first.""", file=sys.stderr)
+    issue = find_issue(content, filename, is_python, is_bash)
+    if issue is not None:
+        report_issue(issue, filename)
         sys.exit(2)
 
-    # Python-specific checks
-    if is_python:
-        # Parse Python code
-        try:
-            tree = ast.parse(content, filename=filename)
-        except SyntaxError:
-            # If code has syntax errors, let it through - other tools will catch it
-            log(f"Syntax error in {filename}, skipping check")
-            sys.exit(0)
-
-        # Check for try-except-pass patterns
-        issues = check_try_except_pass(tree)
-        if issues:
-            lineno, desc = issues[0]
-            log(f"DETECTED: except-pass in {filename}:{lineno}")
-            print(f"""❌ POSSIBLE FALLBACK in {filename}:{lineno}
-
-Found: {desc}
-
-Core principle: Code should FAIL, not hide errors.
-If this is legitimate error handling, make it explicit with logging/re-raising.""", file=sys.stderr)
-            sys.exit(2)
-
-    # Bash-specific checks
-    if is_bash:
-        issues = check_bash_fallbacks(content)
-        if issues:
-            lineno, desc = issues[0]
-            log(f"DETECTED: bash fallback in {filename}:{lineno}")
-            print(f"""❌ BASH FALLBACK in {filename}:{lineno}
-
-Found: {desc}
-
-Core principle: Code should FAIL, not hide errors.
-Using || true or || : suppresses errors silently.
-
-If this is truly needed, ask the user first.""", file=sys.stderr)
-            sys.exit(2)
-
     log("No fallbacks detected")
     sys.exit(0)
 
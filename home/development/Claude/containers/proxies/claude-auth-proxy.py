@@ -1,21 +1,139 @@
 #!/usr/bin/env python3
 
 import argparse
+import getpass
+import http.client
+import io
 import json
 import os
+import platform
 import subprocess
 import sys
-import urllib.error
-import urllib.request
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 
-ANTHROPIC_API_BASE = "https://api.anthropic.com"
+ANTHROPIC_API_HOST = "api.anthropic.com"
 DUMMY_TOKENS = [
     "sk-ant-REDACTED"
 ]
 
+# Request headers that can carry the dummy token
+TOKEN_HEADERS = ["authorization", "x-api-key"]
+
+# Hop-by-hop headers (RFC 7230) apply to a single connection and are not relayed
+HOP_BY_HOP_HEADERS = frozenset(
+    [
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+    ]
+)
+
 VERBOSE_LOGGING = False
 
+# Upper bound on each read when relaying an upstream response body
+STREAM_CHUNK_SIZE = 65536
+
+# Re-read credentials at least this often, even if the token claims a later expiry
+TOKEN_CACHE_SECONDS = 300
+
+# Idle keep-alive connections to the API, reused to skip TCP/TLS setup
+MAX_IDLE_CONNECTIONS = 8
+UPSTREAM_TIMEOUT = 600
+
+_pool_lock = threading.Lock()
+_idle_connections = []
+
+_token_lock = threading.Lock()
+_cached_token = None
+_cached_token_expiry = 0.0  # time.monotonic() deadline for _cached_token
+_cached_token_stamp = None  # credentials_stamp() when _cached_token was read
+
+# Serializes claude -p refreshes, so concurrent 401s share a single one
+_refresh_lock = threading.Lock()
+
+# Linux credential locations, in the order get-claude-credentials.sh checks them
+LINUX_CREDENTIAL_FILES = [
+    Path.home() / ".claude" / ".credentials.json",
+    Path.home() / ".config" / "claude" / "auth.json",
+]
+
+
+def read_credentials():
+    """Read the credentials JSON the same way get-claude-credentials.sh does."""
+    system = platform.system()
+
+    if system == "Darwin":
+        # macOS: Use Keychain
+        result = subprocess.run(
+            [
+                "security",
+                "find-generic-password",
+                "-s",
+                "Claude Code-credentials",
+                "-a",
+                getpass.getuser(),
+                "-w",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        return result.stdout if result.returncode == 0 else None
+
+    if system == "Linux":
+        for credentials_file in LINUX_CREDENTIAL_FILES:
+            if credentials_file.is_file():
+                return credentials_file.read_text()
+
+    return None
+
+
+def credentials_stamp():
+    """Identify the current Linux credentials file version as (path, mtime_ns).
+
+    A cached token is reused only while this stays the same, so a refresh
+    written by claude is picked up without waiting for the cache to expire.
+    Returns None on macOS, where the Keychain has no file to stat.
+    """
+    if platform.system() != "Linux":
+        return None
+    for credentials_file in LINUX_CREDENTIAL_FILES:
+        try:
+            return credentials_file, credentials_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def new_upstream_connection():
+    return http.client.HTTPSConnection(ANTHROPIC_API_HOST, timeout=UPSTREAM_TIMEOUT)
+
+
+def acquire_upstream_connection():
+    """Return (connection, reused), preferring an idle pooled connection."""
+    with _pool_lock:
+        if _idle_connections:
+            return _idle_connections.pop(), True
+    return new_upstream_connection(), False
+
+
+def release_upstream_connection(conn, resp):
+    """Return a connection to the pool once its response has been fully read."""
+    if not resp.will_close and resp.isclosed():
+        with _pool_lock:
+            if len(_idle_connections) < MAX_IDLE_CONNECTIONS:
+                _idle_connections.append(conn)
+                return
+    conn.close()
+
 
 class ClaudeAuthProxyHandler(BaseHTTPRequestHandler):
     def log_message(self, format, *args):
@@ -26,29 +144,53 @@ class ClaudeAuthProxyHandler(BaseHTTPRequestHandler):
             )
 
     def get_real_oauth_token(self):
+        global _cached_token, _cached_token_expiry, _cached_token_stamp
+
+        with _token_lock:
+            stamp = credentials_stamp()
+            if (
+                _cached_token
+                and stamp == _cached_token_stamp
+                and time.monotonic() < _cached_token_expiry
+            ):
+                return _cached_token
+
+            token, expires_at = self.read_oauth_token()
+            if token:
+                lifetime = TOKEN_CACHE_SECONDS
+                if expires_at:
+                    # expiresAt is a Unix timestamp in milliseconds
+                    lifetime = min(lifetime, expires_at / 1000 - time.time())
+                _cached_token = token
+                _cached_token_expiry = time.monotonic() + lifetime
+                _cached_token_stamp = stamp
+            return token
+
+    def invalidate_oauth_token(self):
+        global _cached_token
+
+        with _token_lock:
+            _cached_token = None
+
+    def read_oauth_token(self):
         try:
-            result = subprocess.run(
-                ["get-claude-credentials.sh"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
+            credentials = read_credentials()
 
-            if result.returncode == 0 and result.stdout:
-                creds = json.loads(result.stdout.strip())
+            if credentials:
+                creds = json.loads(credentials.strip())
 
                 if "claudeAiOauth" in creds:
                     oauth_data = creds["claudeAiOauth"]
 
                     if "accessToken" in oauth_data:
-                        return oauth_data["accessToken"]
+                        return oauth_data["accessToken"], oauth_data.get("expiresAt")
 
         except json.JSONDecodeError:
             pass
         except Exception:
             pass
 
-        return None
+        return None, None
 
     def do_POST(self):
         self.handle_request("POST")
@@ -62,6 +204,44 @@ class ClaudeAuthProxyHandler(BaseHTTPRequestHandler):
     def do_DELETE(self):
         self.handle_request("DELETE")
 
+    def relay_response(self, status, headers, body):
+        """Send an upstream response to the client, streaming the body through."""
+        self.send_response(status)
+        for key, value in headers:
+            if key.lower() not in HOP_BY_HOP_HEADERS:
+                self.send_header(key, value)
+        self.end_headers()
+
+        # read1 returns as soon as any data is available, so streamed (SSE)
+        # events reach the client as they arrive instead of after the last one
+        while chunk := body.read1(STREAM_CHUNK_SIZE):
+            self.wfile.write(chunk)
+
+    def send_upstream(self, method, headers, body):
+        """Send the request to the API, returning (connection, response)."""
+        conn, reused = acquire_upstream_connection()
+        try:
+            self.write_upstream_request(conn, method, headers, body)
+            return conn, conn.getresponse()
+        except ConnectionError:
+            conn.close()
+            if not reused:
+                raise
+        # The server dropped the idle connection; send once more on a new one
+        conn = new_upstream_connection()
+        self.write_upstream_request(conn, method, headers, body)
+        return conn, conn.getresponse()
+
+    def write_upstream_request(self, conn, method, headers, body):
+        """Write the request line, the (name, value) header list and body."""
+        has_accept_encoding = any(name.lower() == "accept-encoding" for name, _ in headers)
+        conn.putrequest(method, self.path, skip_host=True,
+                        skip_accept_encoding=has_accept_encoding)
+        for name, value in headers:
+            conn.putheader(name, value)
+        conn.putheader("Content-Length", str(len(body)))
+        conn.endheaders(body)
+
     def handle_request(self, method):
         content_length = int(self.headers.get("Content-Length", 0))
         body = self.rfile.read(content_length) if content_length > 0 else b""
@@ -71,95 +251,79 @@ class ClaudeAuthProxyHandler(BaseHTTPRequestHandler):
             self.send_error(500, "No credentials found")
             return
 
-        url = f"{ANTHROPIC_API_BASE}{self.path}"
-        headers = dict(self.headers)
-
-        # Inject real credentials
+        # Forward everything except hop-by-hop headers, injecting real
+        # credentials into the auth headers (the only ones carrying the token)
+        headers = []
         token_replaced = False
-        for name, value in headers.items():
-            if isinstance(value, str):
+        for name, value in self.headers.items():
+            lower = name.lower()
+            if lower in HOP_BY_HOP_HEADERS or lower in ("content-length", "host"):
+                continue
+            if lower in TOKEN_HEADERS:
                 for dummy in DUMMY_TOKENS:
                     if dummy in value:
                         value = value.replace(dummy, real_token)
                         token_replaced = True
-                headers[name] = value
+            headers.append((name, value))
 
         if not token_replaced:
             self.send_error(500, "No dummy tokens found to replace")
             return
 
-        # Fix headers
-        headers.pop("Content-Length", None)
-        headers.pop("Connection", None)
-        headers["Host"] = "api.anthropic.com"
+        headers.append(("Host", ANTHROPIC_API_HOST))
 
         try:
-            req = urllib.request.Request(url, data=body, headers=headers, method=method)
-            with urllib.request.urlopen(req, timeout=600) as resp:
-                self.send_response(resp.code)
-                for key, value in resp.headers.items():
-                    if key.lower() not in ["connection", "transfer-encoding"]:
-                        self.send_header(key, value)
-                self.end_headers()
-                self.wfile.write(resp.read())
-
-        except urllib.error.HTTPError as e:
+            conn, resp = self.send_upstream(method, headers, body)
+
             # If we get a 401, try to refresh token with claude -p and retry once
-            if e.code == 401:
+            if resp.status == 401:
+                error_headers = resp.getheaders()
+                error_body = resp.read()
+                release_upstream_connection(conn, resp)
                 try:
-                    subprocess.run(
-                        ["claude", "-p", "hi claude, may you be happy"],
-                        capture_output=True,
-                        timeout=30,
-                    )
-
-                    # Get fresh token after refresh
-                    fresh_token = self.get_real_oauth_token()
+                    with _refresh_lock:
+                        # Another request may have refreshed while we waited
+                        self.invalidate_oauth_token()
+                        fresh_token = self.get_real_oauth_token()
+                        if not fresh_token or fresh_token == real_token:
+                            subprocess.run(
+                                ["claude", "-p", "hi claude, may you be happy"],
+                                capture_output=True,
+                                timeout=30,
+                            )
+
+                            # Get fresh token after refresh
+                            self.invalidate_oauth_token()
+                            fresh_token = self.get_real_oauth_token()
+
                     if fresh_token and fresh_token != real_token:
-                        # Update headers with fresh token
-                        for name, value in headers.items():
-                            if isinstance(value, str):
-                                for dummy in DUMMY_TOKENS:
-                                    if real_token in value:
-                                        value = value.replace(real_token, fresh_token)
-                                headers[name] = value
+                        # Swap the token in the auth headers it was injected into
+                        headers = [
+                            (name, value.replace(real_token, fresh_token))
+                            if name.lower() in TOKEN_HEADERS
+                            else (name, value)
+                            for name, value in headers
+                        ]
 
                         # Retry request with fresh token
-                        retry_req = urllib.request.Request(
-                            url, data=body, headers=headers, method=method
-                        )
-                        with urllib.request.urlopen(
-                            retry_req, timeout=600
-                        ) as retry_resp:
-                            self.send_response(retry_resp.code)
-                            for key, value in retry_resp.headers.items():
-                                if key.lower() not in [
-                                    "connection",
-                                    "transfer-encoding",
-                                ]:
-                                    self.send_header(key, value)
-                            self.end_headers()
-                            self.wfile.write(retry_resp.read())
+                        conn, resp = self.send_upstream(method, headers, body)
+                        self.relay_response(resp.status, resp.getheaders(), resp)
+                        release_upstream_connection(conn, resp)
                         return
 
                 except Exception:
                     pass  # Fall through to original error handling
 
-            # Original error handling for non-401 or failed retry
-            error_body = e.read()
-            error_headers = dict(e.headers) if hasattr(e, "headers") else {}
+                # Original error handling for failed retry
+                self.relay_response(401, error_headers, io.BytesIO(error_body))
+                return
 
-            self.send_response(e.code)
-            for key, value in error_headers.items():
-                if key.lower() not in ["connection", "transfer-encoding"]:
-                    self.send_header(key, value)
-            self.end_headers()
-            self.wfile.write(error_body)
+            self.relay_response(resp.status, resp.getheaders(), resp)
+            release_upstream_connection(conn, resp)
 
         except Exception as e:
             self.send_error(502, f"Bad Gateway: {str(e)}")
 
-
 def main():
     global VERBOSE_LOGGING
     parser = argparse.ArgumentParser(description="Claude Authentication Proxy")
@@ -170,7 +334,8 @@ def main():
     VERBOSE_LOGGING = args.verbose
 
     try:
-        server = HTTPServer(("0.0.0.0", args.port), ClaudeAuthProxyHandler)
+        # Each request gets its own (daemon) thread so long streams do not block others
+        server = ThreadingHTTPServer(("0.0.0.0", args.port), ClaudeAuthProxyHandler)
         if VERBOSE_LOGGING:
             print(
                 f"Proxy listening on port {args.port} (verbose mode)", file=sys.stderr
@@ -3,15 +3,21 @@
 RunPod Deployment Tool
 """
 
+import contextlib
 import json
 import logging
 import os
 import re
 import shlex
+import stat
+import string
 import subprocess
 import sys
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 # Set up logging - default to WARNING, only show DEBUG/INFO if --debug flag is set
 log_level = logging.WARNING
@@ -26,29 +32,114 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
+# Key provided inside the claudebox container, probed once at startup
+CONTAINER_SSH_KEY: Optional[Path] = Path("/home/node/.ssh/runpod_key")
+if not CONTAINER_SSH_KEY.is_file():
+    CONTAINER_SSH_KEY = None
+
+# SSH keys must live under one of these (resolved once, as keys are)
+ALLOWED_SSH_KEY_DIRS = [
+    (Path.home() / ".ssh").resolve(),
+    Path("/etc/ssh").resolve(),  # System keys
+]
+
+# Allowed config value characters
+_HOST_CHARS = frozenset(string.ascii_letters + string.digits + ".-")
+_USER_CHARS = _HOST_CHARS | {"_"}
+_REMOTE_DIR_CHARS = _USER_CHARS | {"~", "/"}
+_PARENT_DIR_RE = re.compile(r"(^|/)\.\.(/|$)")
+
+# Summary lines from rsync --stats
+_RSYNC_CREATED_RE = re.compile(r"Number of created files:\s*(\d+)")
+_RSYNC_TRANSFERRED_RE = re.compile(r"Number of regular files transferred:\s*(\d+)")
+_RSYNC_FILES_RE = re.compile(r"Number of files:\s*(\d+)")
+
+# Commands that edit files in place (always warned about when run remotely)
+INTERACTIVE_EDITORS = ["vim", "nano", "emacs", "vi", "ed", "ex", "sed", "awk"]
+
+# Signs that a remote command writes files, found in a single scan.
+# Redirections only count together with a command that produces the content.
+_REMOTE_WRITE_RE = re.compile(
+    r"(?P<tee>\|\s*tee\b)"
+    r"|(?P<redirect>>|<<)"
+    r"|(?P<writer>\b(?:cat|echo|printf)\b)"
+    r"|(?P<python>\bpython3? -c\b.*?open\(.*?['\"]w['\"])"
+    r"|(?P<perl>\bperl -e\b.*?open ?\()"
+    r"|(?P<ruby>\bruby -e\b.*?File\.write)",
+    re.DOTALL,
+)
 
-def find_config() -> Optional[Path]:
-    """Find .runpod_config.json in git repository root or current directory."""
-    # First check current directory
-    cwd_config = Path.cwd() / ".runpod_config.json"
-    if cwd_config.is_file():
-        return cwd_config
+# Share one SSH connection between the ssh/rsync calls of a command, and
+# across runpod commands run within 10 minutes, skipping repeated handshakes.
+# sshfs is left out: see mount_directory
+SSH_MULTIPLEX_OPTIONS = [
+    "-o",
+    "ControlMaster=auto",
+    "-o",
+    "ControlPath=~/.ssh/runpod-cm-%C",
+    "-o",
+    "ControlPersist=600",
+]
+
+# How much trailing rsync output to keep for the stats summary and ssh errors
+RSYNC_TAIL_BYTES = 8192
+
+
+@dataclass(frozen=True)
+class GitInfo:
+    """Repository layout as seen from the current directory."""
+
+    toplevel: Path
+    cdup: str  # Relative path from cwd up to toplevel, "" at the root
 
+
+@lru_cache(maxsize=1)
+def _git_info() -> Optional[GitInfo]:
+    """Query git once for everything runpod needs, or None outside a repo.
+
+    Cached so a single runpod invocation runs git at most once.
+    """
     try:
-        # Find git repository root
         result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
+            ["git", "rev-parse", "--show-toplevel", "--show-cdup"],
             capture_output=True,
             text=True,
             check=True,
         )
-        repo_root = Path(result.stdout.strip())
-        config_file = repo_root / ".runpod_config.json"
-        return config_file if config_file.is_file() else None
     except (subprocess.CalledProcessError, FileNotFoundError):
         # Not in a git repo or git not available
         return None
 
+    # One line per flag, in order; --show-cdup prints an empty line at the root
+    toplevel, cdup = result.stdout.split("\n")[:2]
+    return GitInfo(
+        toplevel=Path(toplevel),
+        cdup=cdup,
+    )
+
+
+def _git_repo_root() -> Optional[Path]:
+    """Return the git repository root, or None outside a repo."""
+    info = _git_info()
+    return info.toplevel if info is not None else None
+
+
+def find_config() -> Optional[Path]:
+    """Find .runpod_config.json in current directory or git repository root."""
+    # First check current directory; claudebox mounts this one read-only
+    cwd = Path.cwd()
+    cwd_config = cwd / ".runpod_config.json"
+    if cwd_config.is_file():
+        return cwd_config
+
+    # Walk up to the repository root ourselves rather than running git, which
+    # every command pays for
+    for ancestor in (cwd, *cwd.parents):
+        if (ancestor / ".git").exists():
+            config_file = ancestor / ".runpod_config.json"
+            return config_file if config_file.is_file() else None
+    return None
+
 
 def find_sync_ignore() -> Optional[Path]:
     """Find .runpod_sync_ignore in current directory or git repository root."""
@@ -57,74 +148,56 @@ def find_sync_ignore() -> Optional[Path]:
     if cwd_ignore.is_file():
         return cwd_ignore
 
-    try:
-        # Find git repository root
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        repo_root = Path(result.stdout.strip())
-        ignore_file = repo_root / ".runpod_sync_ignore"
-        return ignore_file if ignore_file.is_file() else None
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Not in a git repo or git not available
+    repo_root = _git_repo_root()
+    if repo_root is None:
         return None
+    ignore_file = repo_root / ".runpod_sync_ignore"
+    return ignore_file if ignore_file.is_file() else None
 
 
-def load_sync_ignore() -> List[str]:
-    """Load exclude patterns from .runpod_sync_ignore file.
+@lru_cache(maxsize=1)
+def get_rsync_excludes() -> Tuple[str, ...]:
+    """Build rsync exclude flags from .runpod_sync_ignore.
 
-    Returns list of patterns to exclude. Defaults to just .git/ if no file exists.
+    One pattern per line; surrounding whitespace is stripped and blank lines
+    and # comments are skipped. Defaults to just .git/ if no file exists.
+    Cached, since status runs both a push and a pull.
     """
-    # Default excludes if no ignore file exists
-    default_excludes = [
-        ".git/",
-    ]
-
     ignore_file = find_sync_ignore()
-
     if ignore_file is None:
-        # No ignore file found, use defaults
-        return default_excludes
+        return ("--exclude", ".git/")
 
-    # Read patterns from file
-    patterns = []
     try:
         with open(ignore_file) as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if line and not line.startswith("#"):
-                    patterns.append(line)
-    except Exception as e:
-        logging.warning(f"Could not read {ignore_file}: {e}")
-        return default_excludes
-
-    return patterns
-
+            lines = [line.strip() for line in f]
+    except OSError as e:
+        print(f"❌ Could not read {ignore_file}: {e}")
+        sys.exit(1)
 
-def get_rsync_excludes() -> List[str]:
-    """Build rsync exclude flags from sync ignore patterns."""
-    excludes = []
-    for pattern in load_sync_ignore():
-        excludes.extend(["--exclude", pattern])
-    return excludes
+    return tuple(
+        flag
+        for line in lines
+        if line and not line.startswith("#")
+        for flag in ("--exclude", line)
+    )
 
 
 def load_config(config_file: Path) -> Dict[str, str]:
     """Load and validate JSON configuration."""
-    # Security check: ensure config file is a regular file, not a symlink/device
-    if not config_file.is_file() or config_file.is_symlink():
+    # Security check: ensure config file is a regular file, not a symlink/device.
+    # A single lstat answers both, since it doesn't follow symlinks
+    try:
+        is_regular_file = stat.S_ISREG(os.lstat(config_file).st_mode)
+    except OSError:
+        is_regular_file = False
+    if not is_regular_file:
         print(
             f"❌ Config file must be a regular file (not symlink/device): {config_file}"
         )
         sys.exit(1)
 
     try:
-        with open(config_file) as f:
-            config = json.load(f)
+        config = json.loads(config_file.read_bytes())
     except json.JSONDecodeError as e:
         print(f"❌ Invalid JSON in {config_file}: {e}")
         sys.exit(1)
@@ -139,34 +212,34 @@ def load_config(config_file: Path) -> Dict[str, str]:
         print(f"❌ Missing required fields in {config_file}: {', '.join(missing)}")
         sys.exit(1)
 
-    # Validate config values for security (before quoting)
+    # Validate config values for security. Values are kept raw; the strict
+    # formats make them shell-safe, and paths are quoted where they reach a
+    # remote shell (see remote_shell_path)
     validate_config_values(config)
 
-    # Make all config values shell-safe by quoting them
-    config["user"] = shlex.quote(config["user"])
-    config["host"] = shlex.quote(config["host"])
-    config["port"] = shlex.quote(config["port"])
-    config["remote_dir"] = shlex.quote(config["remote_dir"])
-    # SSH key will be quoted when expanded to Path
-
     return config
 
 
+@lru_cache(maxsize=1)
 def has_ssh_agent() -> bool:
     """Check if SSH agent is available."""
     return "SSH_AUTH_SOCK" in os.environ and Path(os.environ["SSH_AUTH_SOCK"]).exists()
 
 
+@lru_cache(maxsize=4)
 def validate_ssh_key_path(ssh_key_path: str) -> Optional[Path]:
-    """Validate SSH key is in expected locations only. Returns None if using SSH agent."""
+    """Validate SSH key is in expected locations only. Returns None if using SSH agent.
+
+    Cached, since every ssh/rsync call site re-validates the same configured
+    key and the agent check runs ssh-keygen and ssh-add.
+    """
     # First resolve the configured key path
     ssh_key = Path(ssh_key_path).expanduser().resolve()
 
     # Check if running in container and key is available
-    container_key = Path("/home/node/.ssh/runpod_key")
-    if container_key.is_file():
-        logging.debug(f"Using container SSH key: {container_key}")
-        return container_key
+    if CONTAINER_SSH_KEY is not None:
+        logging.debug(f"Using container SSH key: {CONTAINER_SSH_KEY}")
+        return CONTAINER_SSH_KEY
 
     # If SSH agent is available, check if it has the specific key loaded
     if has_ssh_agent():
@@ -222,31 +295,27 @@ def validate_ssh_key_path(ssh_key_path: str) -> Optional[Path]:
     logging.debug(f"Using SSH key file: {ssh_key}")
 
     # Only allow keys in standard SSH directories
-    allowed_dirs = [
-        Path.home() / ".ssh",
-        Path("/etc/ssh"),  # System keys
-    ]
+    if not any(ssh_key.is_relative_to(d) for d in ALLOWED_SSH_KEY_DIRS):
+        print(f"❌ SSH key must be in ~/.ssh/ or /etc/ssh/, got: {ssh_key}")
+        sys.exit(1)
 
-    for allowed_dir in allowed_dirs:
-        try:
-            ssh_key.relative_to(allowed_dir.resolve())
-            # Additional check that file exists and is readable
-            if not ssh_key.is_file():
-                print(f"❌ SSH key not found: {ssh_key}")
-                sys.exit(1)
-            return ssh_key  # Path is within allowed directory
-        except ValueError:
-            continue
+    # Additional check that file exists and is readable
+    if not ssh_key.is_file():
+        print(f"❌ SSH key not found: {ssh_key}")
+        sys.exit(1)
+    return ssh_key
 
-    print(f"❌ SSH key must be in ~/.ssh/ or /etc/ssh/, got: {ssh_key}")
-    sys.exit(1)
+
+def _only_chars(value: str, allowed: FrozenSet[str]) -> bool:
+    """Check value is a non-empty string made up only of allowed characters."""
+    return isinstance(value, str) and value != "" and allowed.issuperset(value)
 
 
 def validate_config_values(config: Dict[str, str]) -> None:
     """Validate configuration values for security."""
 
     # Validate hostname (alphanumeric, dots, hyphens only)
-    if not re.match(r"^[a-zA-Z0-9.-]+$", config["host"]):
+    if not _only_chars(config["host"], _HOST_CHARS):
         print(f"❌ Invalid host format: {config['host']}")
         sys.exit(1)
 
@@ -260,32 +329,69 @@ def validate_config_values(config: Dict[str, str]) -> None:
         sys.exit(1)
 
     # Validate username (alphanumeric and common safe chars)
-    if not re.match(r"^[a-zA-Z0-9_.-]+$", config["user"]):
+    if not _only_chars(config["user"], _USER_CHARS):
         print(f"❌ Invalid user format: {config['user']}")
         sys.exit(1)
 
     # Validate SSH key path is in allowed directories
     validate_ssh_key_path(config["ssh_key"])
 
-    # Validate remote directory (allow tilde for home directory)
-    if not re.match(r"^[a-zA-Z0-9_.~/-]+$", config["remote_dir"]):
-        print(f"❌ Invalid remote directory format: {config['remote_dir']}")
+    # Validate remote directory (allow tilde for home directory, but no ..)
+    remote_dir = config["remote_dir"]
+    if not _only_chars(remote_dir, _REMOTE_DIR_CHARS) or _PARENT_DIR_RE.search(
+        remote_dir
+    ):
+        print(f"❌ Invalid remote directory format: {remote_dir}")
+        sys.exit(1)
+
+    # Optional rsync compression toggle
+    if not isinstance(config.get("compress", True), bool):
+        print(
+            f"❌ Invalid compress value: {config['compress']} (must be true or false)"
+        )
         sys.exit(1)
 
 
-def validate_source_path(source_path: str) -> Path:
+def env_flag(name: str, default: bool) -> bool:
+    """Read a 0/1 environment variable, rejecting any other value."""
+    env_value = os.environ.get(name)
+    if env_value is None:
+        return default
+    if env_value not in ("0", "1"):
+        print(f"❌ Invalid {name}: {env_value} (must be 0 or 1)")
+        sys.exit(1)
+    return env_value == "1"
+
+
+def rsync_compression_enabled(config: Dict[str, str]) -> bool:
+    """Whether rsync should compress transfers.
+
+    Uses the config's "compress" field, then RUNPOD_COMPRESS, defaulting to on.
+    Compression helps for source code over a home connection but only burns
+    CPU on already-compressed artifacts such as model checkpoints.
+    """
+    if "compress" in config:
+        return config["compress"]
+    return env_flag("RUNPOD_COMPRESS", default=True)
+
+
+@lru_cache(maxsize=1)
+def _cwd_real() -> str:
+    """Resolved current directory; runpod never changes directory."""
+    return os.path.realpath(os.getcwd())
+
+
+def validate_source_path(source_path: str) -> str:
     """Validate source path is within current directory tree."""
-    current_real = Path.cwd().resolve()
+    current_real = _cwd_real()
     try:
-        source_real = Path(source_path).resolve()
-    except Exception:
+        source_real = os.path.realpath(source_path)
+    except ValueError:  # Embedded null byte
         print(f"❌ Invalid source directory: {source_path}")
         sys.exit(1)
 
     # Check if source is current directory or subdirectory
-    try:
-        source_real.relative_to(current_real)
-    except ValueError:
+    if os.path.commonpath([source_real, current_real]) != current_real:
         print(f"❌ Security error: Can only sync current directory or subdirectories")
         print(f"   Attempted: {source_path}")
         print(f"   Resolved to: {source_real}")
@@ -296,36 +402,107 @@ def validate_source_path(source_path: str) -> Path:
     return source_real
 
 
+# (host, port) pairs already confirmed or added to known_hosts by this process
+_known_hosts_verified = set()
+
+
+def known_hosts_contains(host_entry: str, known_hosts: Path) -> bool:
+    """Check a known_hosts file for a host entry.
+
+    ssh-keygen -F matches the exact host entry (including hashed ones) the
+    way ssh itself looks it up.
+    """
+    try:
+        result = subprocess.run(
+            ["ssh-keygen", "-F", host_entry, "-f", str(known_hosts)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        print("❌ ssh-keygen command not found")
+        sys.exit(1)
+    return result.returncode == 0 and bool(result.stdout)
+
+
+def ssh_config_knows_host(host: str, port: str) -> bool:
+    """Check whether ssh's own configuration already pins the host key.
+
+    ~/.ssh/config can point the host at a HostKeyAlias or other known_hosts
+    files, in which case ssh connects fine without a new scanned entry.
+    ssh -G resolves the config locally without connecting.
+    """
+    try:
+        result = subprocess.run(
+            ["ssh", "-G", "-p", port, host],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        print("❌ ssh command not found")
+        sys.exit(1)
+    if result.returncode != 0:
+        return False
+
+    options = {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(" ")
+        options[key] = value
+
+    # ssh looks up a HostKeyAlias as-is, ignoring the port
+    host_entry = options.get("hostkeyalias")
+    if host_entry is None:
+        hostname = options.get("hostname", host)
+        port = options.get("port", port)
+        host_entry = hostname if port == "22" else f"[{hostname}]:{port}"
+
+    known_hosts_files = (
+        options.get("userknownhostsfile", "").split()
+        + options.get("globalknownhostsfile", "").split()
+    )
+    for known_hosts_file in known_hosts_files:
+        known_hosts = Path(os.path.expanduser(known_hosts_file))
+        if known_hosts.is_file() and known_hosts_contains(host_entry, known_hosts):
+            return True
+    return False
+
+
 def ensure_host_in_known_hosts(config: Dict[str, str]) -> None:
     """Ensure the host is in known_hosts."""
     host = config["host"]
     port = config["port"]
+    if (host, port) in _known_hosts_verified:
+        return
 
     ssh_dir = Path.home() / ".ssh"
     ssh_dir.mkdir(mode=0o700, exist_ok=True)
     known_hosts = ssh_dir / "known_hosts"
 
-    # Check if host is already in known_hosts
-    if known_hosts.exists():
-        with open(known_hosts) as f:
-            content = f.read()
-            if f"[{host}]:{port}" in content or f"{host}" in content:
-                return
+    # Check if host is already in known_hosts; ssh stores non-default ports
+    # as [host]:port
+    host_entry = host if port == "22" else f"[{host}]:{port}"
+    if known_hosts.exists() and known_hosts_contains(host_entry, known_hosts):
+        _known_hosts_verified.add((host, port))
+        return
+
+    # Only consult the ssh config on a miss, before falling back to a scan
+    if ssh_config_knows_host(host, port):
+        _known_hosts_verified.add((host, port))
+        return
 
     print(f"🔑 Adding {host}:{port} to known_hosts...")
     try:
-        # Run ssh-keyscan and append to known_hosts
-        result = subprocess.run(
-            ["ssh-keyscan", "-p", port, host],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        # Append to known_hosts
+        # Run ssh-keyscan with its output appended straight to known_hosts
         with open(known_hosts, "a") as f:
-            f.write(result.stdout)
+            subprocess.run(
+                ["ssh-keyscan", "-p", port, host],
+                stdout=f,
+                stderr=subprocess.DEVNULL,
+                check=True,
+            )
 
+        _known_hosts_verified.add((host, port))
         print(f"✅ Added {host}:{port} to known_hosts")
     except subprocess.CalledProcessError as e:
         print(f"⚠️  Warning: Could not scan host keys: {e}")
@@ -334,12 +511,48 @@ def ensure_host_in_known_hosts(config: Dict[str, str]) -> None:
         print(f"⚠️  Warning: Could not update known_hosts: {e}")
 
 
+def is_host_key_failure(ssh_output: str) -> bool:
+    """Check whether ssh output shows the host key was rejected."""
+    output_lower = ssh_output.lower()
+    return (
+        "host key verification failed" in output_lower
+        or "remote host identification has changed" in output_lower
+        or "offending" in output_lower
+    )
+
+
+def print_host_key_help(config: Dict[str, str]) -> None:
+    """Explain how to clear a stale host key after RunPod reuses an IP:port."""
+    print("❌ SSH host key verification failed")
+    print()
+    print(
+        "🔍 COMMON ISSUE: RunPod reused the same IP:port for a different machine."
+    )
+    print("   The cached host key doesn't match the new machine.")
+    print()
+    print("📝 SOLUTION: Remove the old host key entry:")
+    print(f'   ssh-keygen -R "[{config["host"]}]:{config["port"]}"')
+    print()
+    print("   Then try your runpod command again.")
+
+
+def remote_shell_path(path: str) -> str:
+    """Render a remote path for the remote shell.
+
+    Paths in the validated remote_dir format are left bare so a leading ~
+    still expands to the remote home directory; anything else is quoted.
+    """
+    if _only_chars(path, _REMOTE_DIR_CHARS):
+        return path
+    return shlex.quote(path)
+
+
 def ensure_remote_dir_exists(config: Dict[str, str]) -> None:
     """Ensure remote directory exists, create if missing."""
     ensure_host_in_known_hosts(config)
     ssh_key = validate_ssh_key_path(config["ssh_key"])
 
-    cmd = ["ssh"]
+    cmd = ["ssh", *SSH_MULTIPLEX_OPTIONS]
 
     if ssh_key is not None:
         cmd.extend(["-i", str(ssh_key)])
@@ -348,7 +561,7 @@ def ensure_remote_dir_exists(config: Dict[str, str]) -> None:
     cmd.append(f"{config['user']}@{config['host']}")
 
     # Use mkdir -p to create directory if it doesn't exist
-    cmd.append(f"mkdir -p {config['remote_dir']}")
+    cmd.append(f"mkdir -p {remote_shell_path(config['remote_dir'])}")
 
     try:
         subprocess.run(cmd, check=True, capture_output=True)
@@ -361,6 +574,30 @@ def ensure_remote_dir_exists(config: Dict[str, str]) -> None:
         sys.exit(1)
 
 
+def detect_remote_file_edit(command: str) -> Optional[str]:
+    """Describe how command appears to edit files remotely, or None."""
+    command_parts = command.split(maxsplit=1)
+    if command_parts and command_parts[0] in INTERACTIVE_EDITORS:
+        return f"You're running '{command_parts[0]}' on the remote server"
+
+    kinds = {match.lastgroup for match in _REMOTE_WRITE_RE.finditer(command)}
+    if "tee" in kinds or {"redirect", "writer"} <= kinds:
+        detected = "file write pattern in command"
+    elif "python" in kinds:
+        detected = "Python one-liner writing files"
+    elif "perl" in kinds:
+        detected = "Perl one-liner writing files"
+    elif "ruby" in kinds:
+        detected = "Ruby one-liner writing files"
+    else:
+        return None
+
+    return (
+        f"Detected {detected}\n"
+        f"   Command appears to create/modify files remotely: {command[:60]}..."
+    )
+
+
 def run_ssh_command(
     config: Dict[str, str],
     command: str,
@@ -378,7 +615,7 @@ def run_ssh_command(
     ensure_host_in_known_hosts(config)
     ssh_key = validate_ssh_key_path(config["ssh_key"])
 
-    cmd = ["ssh"]
+    cmd = ["ssh", *SSH_MULTIPLEX_OPTIONS]
 
     # Only add key if not using agent
     if ssh_key is not None:
@@ -395,136 +632,60 @@ def run_ssh_command(
     # Only add command if it's not empty (for interactive sessions)
     if command.strip():
         # Warn if user is trying to edit files remotely
-        # Check for interactive editors (always warn)
-        interactive_editors = ["vim", "nano", "emacs", "vi", "ed", "ex", "sed", "awk"]
-        command_parts = command.split()
-        warned = False
-
-        if command_parts and command_parts[0] in interactive_editors:
-            print(
-                f"⚠️  Warning: You're running '{command_parts[0]}' on the remote server"
-            )
+        edit_warning = detect_remote_file_edit(command)
+        if edit_warning:
+            print(f"⚠️  Warning: {edit_warning}")
             print(
                 f"   Best practice: Edit files locally, then use 'runpod push' to sync"
             )
             print()
-            warned = True
-
-        # Check for file write patterns (redirection, heredoc, tee)
-        if not warned and any(
-            pattern in command for pattern in [">>", ">", "<<", "| tee"]
-        ):
-            # Likely writing/creating files
-            if any(cmd in command for cmd in ["cat", "echo", "printf", "tee"]):
-                print(f"⚠️  Warning: Detected file write pattern in command")
-                print(
-                    f"   Command appears to create/modify files remotely: {command[:60]}..."
-                )
-                print(
-                    f"   Best practice: Edit files locally, then use 'runpod push' to sync"
-                )
-                print()
-                warned = True
-
-        # Check for language one-liners that write files
-        if not warned:
-            # Python one-liners: python -c "open(...,'w')"
-            if (
-                ("python -c" in command or "python3 -c" in command)
-                and "open(" in command
-                and ("'w'" in command or '"w"' in command)
-            ):
-                print(f"⚠️  Warning: Detected Python one-liner writing files")
-                print(
-                    f"   Command appears to create/modify files remotely: {command[:60]}..."
-                )
-                print(
-                    f"   Best practice: Edit files locally, then use 'runpod push' to sync"
-                )
-                print()
-                warned = True
-            # Perl one-liners: perl -e with file operations
-            elif "perl -e" in command and ("open(" in command or "open (" in command):
-                print(f"⚠️  Warning: Detected Perl one-liner writing files")
-                print(
-                    f"   Command appears to create/modify files remotely: {command[:60]}..."
-                )
-                print(
-                    f"   Best practice: Edit files locally, then use 'runpod push' to sync"
-                )
-                print()
-                warned = True
-            # Ruby one-liners: ruby -e with File.write
-            elif "ruby -e" in command and "File.write" in command:
-                print(f"⚠️  Warning: Detected Ruby one-liner writing files")
-                print(
-                    f"   Command appears to create/modify files remotely: {command[:60]}..."
-                )
-                print(
-                    f"   Best practice: Edit files locally, then use 'runpod push' to sync"
-                )
-                print()
-                warned = True
 
         # Wrap command with cd to working directory (default to remote_dir)
         working_dir = cwd if cwd is not None else config["remote_dir"]
         wrapped_command = f"cd {working_dir} && {command}"
         cmd.append(wrapped_command)
 
-    try:
-        # For interactive sessions (no command), don't capture output
-        # Let stdin/stdout/stderr connect directly to terminal
-        if not command.strip():
-            result = subprocess.run(cmd, check=False)
-            if result.returncode != 0:
-                print(f"❌ SSH session exited with code {result.returncode}")
-                sys.exit(1)
-        else:
-            # For commands, capture output so we can parse it
-            result = subprocess.run(cmd, check=False, capture_output=True, text=True)
-
-            # Check for host key verification failure
-            if result.returncode != 0:
-                stderr_lower = result.stderr.lower()
-                if (
-                    "host key verification failed" in stderr_lower
-                    or "remote host identification has changed" in stderr_lower
-                    or "offending" in stderr_lower
-                ):
-                    print("❌ SSH host key verification failed")
-                    print()
-                    print(
-                        "🔍 COMMON ISSUE: RunPod reused the same IP:port for a different machine."
-                    )
-                    print("   The cached host key doesn't match the new machine.")
-                    print()
-                    print("📝 SOLUTION: Remove the old host key entry:")
-                    print(f'   ssh-keygen -R "[{config["host"]}]:{config["port"]}"')
-                    print()
-                    print("   Then try your runpod command again.")
-                    print()
-                    print("Full error:")
-                    print(result.stderr)
-                    sys.exit(1)
-
-                # Print output for other errors
-                if result.stdout:
-                    print(result.stdout)
-                if result.stderr:
-                    print(result.stderr, file=sys.stderr)
-                print(f"❌ SSH command failed with exit code {result.returncode}")
-                sys.exit(1)
-
-            # Command succeeded, print output
-            if result.stdout:
-                print(result.stdout, end="")
-            if result.stderr:
-                print(result.stderr, end="", file=sys.stderr)
+    if not command.strip() or force_tty:
+        # Interactive session (shell or REPL): hand the terminal straight to
+        # ssh. Nothing runs afterwards, so replace this process rather than
+        # wait on a child; ssh's exit status becomes runpod's
+        sys.stdout.flush()
+        try:
+            os.execvp(cmd[0], cmd)
+        except FileNotFoundError:
+            print("❌ ssh command not found")
+            sys.exit(1)
 
+    try:
+        # For commands, capture output so we can parse it
+        result = subprocess.run(cmd, check=False, capture_output=True, text=True)
     except FileNotFoundError:
         print("❌ ssh command not found")
         sys.exit(1)
 
+    # Check for host key verification failure
+    if result.returncode != 0:
+        if is_host_key_failure(result.stderr):
+            print_host_key_help(config)
+            print()
+            print("Full error:")
+            print(result.stderr)
+            sys.exit(1)
+
+        # Print output for other errors
+        if result.stdout:
+            print(result.stdout)
+        if result.stderr:
+            print(result.stderr, file=sys.stderr)
+        print(f"❌ SSH command failed with exit code {result.returncode}")
+        sys.exit(1)
+
+    # Command succeeded, print output
+    if result.stdout:
+        print(result.stdout, end="")
+    if result.stderr:
+        print(result.stderr, end="", file=sys.stderr)
+
 
 def parse_rsync_stats(output: str) -> Tuple[int, int, int]:
     """Parse rsync output to extract file counts."""
@@ -534,121 +695,255 @@ def parse_rsync_stats(output: str) -> Tuple[int, int, int]:
     # Number of deleted files: 0
     # Number of regular files transferred: 10
 
-    total_files = 0
-    created = 0
-    transferred = 0
+    total_files = None
+    created = None
+    transferred = None
 
-    for line in output.split("\n"):
-        if "Number of created files:" in line:
-            match = re.search(r"Number of created files:\s*(\d+)", line)
+    # The summary is at the end, after one line per file, so scan backwards
+    # and stop once all three counts are found
+    for line in reversed(output.split("\n")):
+        if created is None and "Number of created files:" in line:
+            match = _RSYNC_CREATED_RE.search(line)
             if match:
                 created = int(match.group(1))
-        elif "Number of regular files transferred:" in line:
-            match = re.search(r"Number of regular files transferred:\s*(\d+)", line)
+        elif transferred is None and "Number of regular files transferred:" in line:
+            match = _RSYNC_TRANSFERRED_RE.search(line)
             if match:
                 transferred = int(match.group(1))
-        elif "Number of files:" in line and "reg:" in line:
-            match = re.search(r"Number of files:\s*(\d+)", line)
+        elif total_files is None and "Number of files:" in line and "reg:" in line:
+            match = _RSYNC_FILES_RE.search(line)
             if match:
                 total_files = int(match.group(1))
+        if None not in (created, transferred, total_files):
+            break
+
+    return (created or 0, transferred or 0, total_files or 0)
+
+
+def rsync_command(dry_run: bool, compress: bool) -> List[str]:
+    """Build the rsync command and flags shared by push and pull."""
+    if dry_run:
+        # Nothing is transferred, so skip compression and progress output and
+        # just list what would change
+        cmd = ["rsync", "-a", "--dry-run", "--itemize-changes"]
+    else:
+        cmd = ["rsync", "-avz" if compress else "-av", "--progress"]
+    # The --no-* flags must come after -a to override it
+    cmd.extend(["--no-perms", "--no-owner", "--no-group", "--stats"])
+    return cmd
 
-    return (created, transferred, total_files)
+
+def _feed_stdin(pipe, data: bytes) -> None:
+    """Write data to a child's stdin and close it.
+
+    A child that exits before reading everything (rsync on an ssh failure)
+    breaks the pipe. That is not an error of its own: the caller sees the
+    child's exit code and stderr, which say why, so writing just stops.
+    """
+    # Closing flushes, so it can break the pipe too
+    with contextlib.suppress(BrokenPipeError), pipe:
+        pipe.write(data)
+
+
+def _relay(pipe, out, tail: bytearray) -> None:
+    """Copy a child's pipe to out as it arrives, keeping the last bytes in tail."""
+    for chunk in iter(lambda: pipe.read1(65536), b""):
+        out.write(chunk)
+        out.flush()
+        tail += chunk
+        del tail[:-RSYNC_TAIL_BYTES]
+
+
+def run_rsync(
+    cmd: List[str], files_from: Optional[bytes] = None
+) -> Tuple[int, str, str]:
+    """Run rsync, streaming its output to the terminal as it arrives.
+
+    Returns (returncode, stdout_tail, stderr_tail), each the last
+    RSYNC_TAIL_BYTES of that stream: enough for the --stats summary and for
+    an ssh error. stderr stays on its own pipe so file names in the transfer
+    list can't be mistaken for error messages. Output is relayed as raw bytes
+    so --progress redraws (carriage returns) show up live. files_from, if
+    given, is fed to rsync's stdin for --files-from=-.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if files_from is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    feeder = None
+    if files_from is not None:
+        # Feed the list from a thread so a list bigger than the pipe buffer
+        # can't deadlock against rsync's output, and an rsync that exits
+        # early (ssh failure) just drops the rest instead of raising
+        feeder = threading.Thread(target=_feed_stdin, args=(proc.stdin, files_from))
+        feeder.start()
+    err_tail = bytearray()
+    err_relay = threading.Thread(
+        target=_relay, args=(proc.stderr, sys.stderr.buffer, err_tail)
+    )
+    err_relay.start()
+    out_tail = bytearray()
+    _relay(proc.stdout, sys.stdout.buffer, out_tail)
+    proc.wait()
+    err_relay.join()
+    if feeder is not None:
+        feeder.join()
+    return (
+        proc.returncode,
+        out_tail.decode(errors="replace"),
+        err_tail.decode(errors="replace"),
+    )
+
+
+def _git_output(args: List[str], source_path: str) -> bytes:
+    """Run a git command in source_path and return its raw stdout."""
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=source_path, capture_output=True, check=False
+        )
+    except FileNotFoundError:
+        print("❌ git command not found")
+        sys.exit(1)
+    if result.returncode != 0:
+        print(f"❌ Could not list files with git in {source_path}:")
+        print(result.stderr.decode(errors="replace"), end="")
+        sys.exit(1)
+    return result.stdout
+
+
+def git_file_list(source_path: str, changed_only: bool) -> bytes:
+    """List the files under source_path that git knows about.
+
+    That is every tracked file plus untracked files not covered by
+    .gitignore, or with changed_only just the tracked files that differ from
+    HEAD plus those untracked files. Returns a NUL-separated list of paths
+    relative to source_path, suitable for rsync --files-from=- --from0.
+    Files deleted from the working tree are left out since there is nothing
+    to send for them.
+    """
+    untracked = _git_output(
+        ["ls-files", "-z", "--others", "--exclude-standard"], source_path
+    )
+    if changed_only:
+        # Tracked files changed since HEAD, staged or not
+        changed = _git_output(
+            ["diff", "--name-only", "-z", "--relative", "--diff-filter=d", "HEAD"],
+            source_path,
+        )
+        return changed + untracked
+
+    tracked = _git_output(["ls-files", "-z", "--cached"], source_path)
+    deleted = _git_output(["ls-files", "-z", "--deleted"], source_path)
+    if deleted:
+        gone = set(deleted.split(b"\0"))
+        tracked = b"".join(
+            path + b"\0" for path in tracked.split(b"\0") if path and path not in gone
+        )
+    return tracked + untracked
 
 
 def push_directory(
-    config: Dict[str, str], source_dir: str, dest_dir: str, dry_run: bool = False
+    config: Dict[str, str],
+    source_dir: str,
+    dest_dir: str,
+    dry_run: bool = False,
+    incremental: bool = False,
+    git_files: bool = False,
 ) -> None:
-    """Push directory to remote server via rsync."""
+    """Push directory to remote server via rsync.
+
+    With git_files, only files git tracks (or sees as untracked but not
+    ignored) are sent, so rsync never walks ignored build output or data.
+    With incremental, only files git reports as changed are sent, so rsync
+    skips scanning the whole tree on both ends; this assumes the remote
+    already matches HEAD, e.g. from an earlier full push.
+    """
     ensure_host_in_known_hosts(config)
     source_path = validate_source_path(source_dir)
     ssh_key = validate_ssh_key_path(config["ssh_key"])
 
+    files_from = None
+    if incremental or git_files:
+        files_from = git_file_list(source_path, changed_only=incremental)
+        if not files_from:
+            print("✅ Already in sync (git lists no files to send)")
+            return
+
     # Show clear direction
     print(f"📤 Syncing: Local → Remote")
     print(f"   Source: {source_dir}")
     print(f"   Dest:   RunPod:{dest_dir}")
     if dry_run:
         print(f"   Mode:   DRY RUN (no changes will be made)")
+    if incremental:
+        print(f"   Mode:   INCREMENTAL ({files_from.count(0)} changed files)")
+    elif git_files:
+        print(f"   Mode:   GIT FILES ({files_from.count(0)} files)")
 
     # Build SSH command for rsync
+    ssh_cmd = shlex.join(["ssh", *SSH_MULTIPLEX_OPTIONS])
     if ssh_key is not None:
-        ssh_cmd = f"ssh -i {shlex.quote(str(ssh_key))} -p {config['port']}"
-    else:
-        ssh_cmd = f"ssh -p {config['port']}"
+        ssh_cmd += f" -i {shlex.quote(str(ssh_key))}"
+    ssh_cmd += f" -p {config['port']}"
 
-    cmd = [
-        "rsync",
-        "-avz",
-        "--no-perms",
-        "--no-owner",
-        "--no-group",
-        "--stats",
-        "--progress",
-    ]
+    cmd = rsync_command(dry_run, rsync_compression_enabled(config))
 
-    if dry_run:
-        cmd.append("--dry-run")
+    if not dry_run:
+        # Create the destination in the same SSH session rsync uses, rather
+        # than a separate ssh mkdir round trip first
+        cmd.extend(
+            ["--rsync-path", f"mkdir -p {remote_shell_path(dest_dir)} && rsync"]
+        )
 
     # Add exclude patterns from .runpod_sync_ignore
     cmd.extend(get_rsync_excludes())
 
+    if files_from is not None:
+        # The list can run to megabytes on a large repo, far past the pipe
+        # buffer; run_rsync writes it from a thread and copes with rsync
+        # exiting before reading it all
+        cmd.extend(["--files-from=-", "--from0"])
+
     cmd.extend(
         [
             "-e",
             ssh_cmd,
-            f"{shlex.quote(str(source_path))}/",
-            f"{config['user']}@{config['host']}:{shlex.quote(dest_dir)}",
+            f"{source_path}/",
+            f"{config['user']}@{config['host']}:{remote_shell_path(dest_dir)}",
         ]
     )
 
     try:
-        result = subprocess.run(cmd, check=False, capture_output=True, text=True)
-
-        # Print rsync output
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
+        returncode, output, errors = run_rsync(cmd, files_from)
 
         # Check for host key verification failure
-        if result.returncode != 0:
-            stderr_lower = result.stderr.lower()
-            if (
-                "host key verification failed" in stderr_lower
-                or "remote host identification has changed" in stderr_lower
-                or "offending" in stderr_lower
-            ):
-                print()
-                print("❌ SSH host key verification failed")
-                print()
-                print(
-                    "🔍 COMMON ISSUE: RunPod reused the same IP:port for a different machine."
-                )
-                print("   The cached host key doesn't match the new machine.")
-                print()
-                print("📝 SOLUTION: Remove the old host key entry:")
-                print(f'   ssh-keygen -R "[{config["host"]}]:{config["port"]}"')
-                print()
-                print("   Then try your runpod command again.")
-                sys.exit(1)
+        if returncode != 0 and is_host_key_failure(errors):
+            print()
+            print_host_key_help(config)
+            sys.exit(1)
 
         # Handle rsync exit codes
         # 0 = success
         # 23 = partial transfer due to error (often permission warnings, but files transferred)
         # 24 = source files vanished before transfer
-        if result.returncode == 0:
+        if returncode == 0:
             # Parse stats
-            created, transferred, total = parse_rsync_stats(result.stdout)
+            created, transferred, total = parse_rsync_stats(output)
             if dry_run:
                 print(f"\n📊 Would sync: {transferred} files")
             elif transferred > 0:
                 print(f"\n✅ Synced {transferred} files")
             else:
                 print(f"\n✅ Already in sync (no changes)")
-        elif result.returncode == 23:
+        elif returncode == 23:
             print("⚠️  Push complete with warnings (exit code 23: partial transfer)")
             print("   Files were transferred successfully, but some warnings occurred")
         else:
-            print(f"❌ Rsync failed with exit code {result.returncode}")
+            print(f"❌ Rsync failed with exit code {returncode}")
             sys.exit(1)
 
     except FileNotFoundError:
@@ -668,12 +963,12 @@ def pull_directory(
     # Example: rsync remote:/file.json /local/results/file.json
     #   If /local/results/ doesn't exist, rsync creates file.json as a DIRECTORY
     #   and puts the file inside: /local/results/file.json/file.json
-    if not dest_path.exists():
-        parent = dest_path.parent
-        if not parent.exists():
+    if not os.path.exists(dest_path):
+        parent = os.path.dirname(dest_path)
+        if not os.path.exists(parent):
             if not dry_run:
                 print(f"📁 Creating parent directory: {parent}")
-                parent.mkdir(parents=True, exist_ok=True)
+                os.makedirs(parent, exist_ok=True)
 
     # Show clear direction
     print(f"📥 Syncing: Remote → Local")
@@ -683,23 +978,12 @@ def pull_directory(
         print(f"   Mode:   DRY RUN (no changes will be made)")
 
     # Build SSH command for rsync
+    ssh_cmd = shlex.join(["ssh", *SSH_MULTIPLEX_OPTIONS])
     if ssh_key is not None:
-        ssh_cmd = f"ssh -i {shlex.quote(str(ssh_key))} -p {config['port']}"
-    else:
-        ssh_cmd = f"ssh -p {config['port']}"
+        ssh_cmd += f" -i {shlex.quote(str(ssh_key))}"
+    ssh_cmd += f" -p {config['port']}"
 
-    cmd = [
-        "rsync",
-        "-avz",
-        "--no-perms",
-        "--no-owner",
-        "--no-group",
-        "--stats",
-        "--progress",
-    ]
-
-    if dry_run:
-        cmd.append("--dry-run")
+    cmd = rsync_command(dry_run, rsync_compression_enabled(config))
 
     # Add exclude patterns from .runpod_sync_ignore
     cmd.extend(get_rsync_excludes())
@@ -708,59 +992,38 @@ def pull_directory(
         [
             "-e",
             ssh_cmd,
-            f"{config['user']}@{config['host']}:{shlex.quote(source_dir)}",
-            f"{shlex.quote(str(dest_path))}/",
+            f"{config['user']}@{config['host']}:{remote_shell_path(source_dir)}",
+            f"{dest_path}/",
         ]
     )
 
     try:
-        result = subprocess.run(cmd, check=False, capture_output=True, text=True)
-
-        # Print rsync output
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
+        returncode, output, errors = run_rsync(cmd)
 
         # Check for host key verification failure
-        if result.returncode != 0:
-            stderr_lower = result.stderr.lower()
-            if (
-                "host key verification failed" in stderr_lower
-                or "remote host identification has changed" in stderr_lower
-                or "offending" in stderr_lower
-            ):
-                print()
-                print("❌ SSH host key verification failed")
-                print()
-                print(
-                    "🔍 COMMON ISSUE: RunPod reused the same IP:port for a different machine."
-                )
-                print("   The cached host key doesn't match the new machine.")
-                print()
-                print("📝 SOLUTION: Remove the old host key entry:")
-                print(f'   ssh-keygen -R "[{config["host"]}]:{config["port"]}"')
-                print()
-                print("   Then try your runpod command again.")
-                sys.exit(1)
+        if returncode != 0 and is_host_key_failure(errors):
+            print()
+            print_host_key_help(config)
+            sys.exit(1)
 
         # Handle rsync exit codes
         # 0 = success
         # 23 = partial transfer due to error (often permission warnings, but files transferred)
         # 24 = source files vanished before transfer
-        if result.returncode == 0:
+        if returncode == 0:
             # Parse stats
-            created, transferred, total = parse_rsync_stats(result.stdout)
+            created, transferred, total = parse_rsync_stats(output)
             if dry_run:
                 print(f"\n📊 Would sync: {transferred} files")
             elif transferred > 0:
                 print(f"\n✅ Synced {transferred} files")
             else:
                 print(f"\n✅ Already in sync (no changes)")
-        elif result.returncode == 23:
+        elif returncode == 23:
             print("⚠️  Pull complete with warnings (exit code 23: partial transfer)")
             print("   Files were transferred successfully, but some warnings occurred")
         else:
-            print(f"❌ Rsync failed with exit code {result.returncode}")
+            print(f"❌ Rsync failed with exit code {returncode}")
             sys.exit(1)
 
     except FileNotFoundError:
@@ -774,16 +1037,8 @@ def show_status(config: Dict[str, str]) -> None:
     print()
 
     # Default paths
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        local_dir = result.stdout.strip()
-    except:
-        local_dir = "."
+    repo_root = _git_repo_root()
+    local_dir = str(repo_root) if repo_root is not None else "."
 
     remote_dir = config["remote_dir"]
 
@@ -808,32 +1063,62 @@ def show_config(config: Dict[str, str], config_file: Path) -> None:
     print(f"   Port: {config['port']}")
     print(f"   SSH Key: {config['ssh_key']}")
     print(f"   Remote Dir: {config['remote_dir']}")
+    print(f"   Compress: {'yes' if rsync_compression_enabled(config) else 'no'}")
 
 
 def ensure_gitignore(pattern: str) -> None:
     """Ensure pattern is in .gitignore."""
     gitignore_path = Path(".gitignore")
 
-    # Check if we're in a git repo
-    if not Path(".git").exists():
+    # Only touch .gitignore when running from the repository root
+    info = _git_info()
+    if info is None or info.cdup:
         return
 
-    # Read existing gitignore
-    if gitignore_path.exists():
-        with open(gitignore_path, "r") as f:
-            content = f.read()
-        if pattern in content:
-            return
-
-    # Add pattern
-    with open(gitignore_path, "a") as f:
-        if gitignore_path.exists() and not content.endswith("\n"):
-            f.write("\n")
-        f.write(f"{pattern}\n")
+    # Scan existing gitignore line by line and append through the same handle
+    try:
+        with open(gitignore_path, "r+") as f:
+            line = ""
+            for line in f:
+                # Match whole entries, so e.g. "foo/" doesn't count as "o/"
+                if line.strip() == pattern:
+                    return
+            # line is now the last line, which may lack a trailing newline
+            if line and not line.endswith("\n"):
+                f.write("\n")
+            f.write(f"{pattern}\n")
+    except FileNotFoundError:
+        with open(gitignore_path, "w") as f:
+            f.write(f"{pattern}\n")
 
     logging.debug(f"Added {pattern} to .gitignore")
 
 
+def is_mount_point(path: Path) -> bool:
+    """Check whether something is mounted at path.
+
+    On Linux this reads /proc/self/mountinfo instead of stat-ing the path, so
+    a disconnected SSHFS mount (where stat fails) still counts as mounted.
+    """
+    if not sys.platform.startswith("linux"):
+        return os.path.ismount(path)
+
+    # mountinfo escapes whitespace and backslashes in paths as octal
+    escaped = (
+        str(path)
+        .replace("\\", "\\134")
+        .replace(" ", "\\040")
+        .replace("\t", "\\011")
+        .replace("\n", "\\012")
+    )
+    with open("/proc/self/mountinfo") as f:
+        for line in f:
+            # Fields: mount ID, parent ID, major:minor, root, mount point, ...
+            if line.split(" ", 5)[4] == escaped:
+                return True
+    return False
+
+
 def mount_directory(config: Dict[str, str], mount_point: Optional[str] = None) -> None:
     """Mount RunPod remote directory using SSHFS."""
     if mount_point is None:
@@ -842,12 +1127,7 @@ def mount_directory(config: Dict[str, str], mount_point: Optional[str] = None) -
     mount_path = Path(mount_point).resolve()
 
     # Check if already mounted
-    result = subprocess.run(
-        ["mount"],
-        capture_output=True,
-        text=True,
-    )
-    if str(mount_path) in result.stdout:
+    if is_mount_point(mount_path):
         print(f"⚠️  {mount_path} is already mounted")
         print(f"   To unmount: fusermount -u {mount_path}")
         return
@@ -869,9 +1149,15 @@ def mount_directory(config: Dict[str, str], mount_point: Optional[str] = None) -
     print(f"🔗 Mounting {config['user']}@{config['host']}:{config['remote_dir']}")
     print(f"   to {mount_path}")
 
+    # sshfs talks SFTP, which does not expand ~ but resolves relative paths
+    # against the remote home directory
+    remote_dir = config["remote_dir"]
+    if remote_dir == "~" or remote_dir.startswith("~/"):
+        remote_dir = remote_dir[2:]
+
     cmd = [
         "sshfs",
-        f"{config['user']}@{config['host']}:{config['remote_dir']}",
+        f"{config['user']}@{config['host']}:{remote_dir}",
         str(mount_path),
         "-p",
         config["port"],
@@ -881,6 +1167,10 @@ def mount_directory(config: Dict[str, str], mount_point: Optional[str] = None) -
     if ssh_key is not None:
         cmd.extend(["-o", f"IdentityFile={ssh_key}"])
 
+    # The mount keeps its own connection rather than joining a multiplexed
+    # master: keepalives only apply to the master, so a master left over from
+    # an earlier push or run would leave the mount hanging on a dead link
+    # instead of reconnecting
     cmd.extend(
         [
             "-o",
@@ -932,6 +1222,7 @@ def show_help() -> None:
     print(
         '    runpod run "command"            - Run command on RunPod (from remote_dir)'
     )
+    print('    runpod exec "command"           - Push, then run command on RunPod')
     print("    runpod python                  - Interactive Python REPL on RunPod")
     print()
     print("  Other Commands:")
@@ -964,6 +1255,13 @@ def show_help() -> None:
     print('    "ssh_key": "~/.ssh/runpod_key",')
     print('    "remote_dir": "/workspace/your-project/"')
     print("  }")
+    print('  Optional: "compress": false to disable rsync compression (or')
+    print("  RUNPOD_COMPRESS=0), e.g. for already-compressed checkpoints")
+    print()
+    print("  RUNPOD_INCREMENTAL=1 makes push send only files git reports as")
+    print("  changed since HEAD or untracked, instead of scanning the whole tree")
+    print("  RUNPOD_GIT_FILES=1 makes push send only files git tracks or sees as")
+    print("  untracked but not ignored, skipping ignored build output and data")
     print()
     print("Sync Ignore Configuration:")
     print("  Create .runpod_sync_ignore to customize what files to exclude")
@@ -971,112 +1269,131 @@ def show_help() -> None:
     print("  Default: only .git/ is excluded")
 
 
+def push_command(config: Dict[str, str], args: List[str]) -> None:
+    """runpod push [src] [dest]"""
+    # Default to git repo root if no source specified
+    if args:
+        source_dir = args[0]
+    else:
+        repo_root = _git_repo_root()
+        # Not in a git repo, fall back to current directory
+        source_dir = str(repo_root) if repo_root is not None else "."
+
+    dest_dir = args[1] if len(args) > 1 else config["remote_dir"]
+    push_directory(
+        config,
+        source_dir,
+        dest_dir,
+        incremental=env_flag("RUNPOD_INCREMENTAL", default=False),
+        git_files=env_flag("RUNPOD_GIT_FILES", default=False),
+    )
+
+
+def pull_command(config: Dict[str, str], args: List[str]) -> None:
+    """runpod pull [src] [dest]"""
+    source_dir = args[0] if args else config["remote_dir"]
+
+    # Default to git repo root if no dest specified
+    if len(args) > 1:
+        dest_dir = args[1]
+    else:
+        repo_root = _git_repo_root()
+        # Not in a git repo, fall back to current directory
+        dest_dir = str(repo_root) if repo_root is not None else "."
+
+    pull_directory(config, source_dir, dest_dir)
+
+
+def parse_run_args(name: str, args: List[str]) -> Tuple[Optional[str], str]:
+    """Parse [--cwd DIR] 'command' for run and exec into (cwd, command)."""
+    if not args:
+        print(f"Usage: runpod {name} [--cwd DIR] 'command to execute'")
+        sys.exit(1)
+
+    # Parse optional --cwd flag
+    cwd = None
+    if args[0] == "--cwd":
+        if len(args) < 3:
+            print(f"Usage: runpod {name} --cwd DIR 'command to execute'")
+            sys.exit(1)
+        cwd = args[1]
+        args = args[2:]
+
+    # Intentionally allow arbitrary command execution on remote server
+    # This is the core feature - let Claude/user run whatever they want
+    return cwd, " ".join(args)
+
+
+def run_command(config: Dict[str, str], args: List[str]) -> None:
+    """runpod run [--cwd DIR] 'command'"""
+    cwd, command = parse_run_args("run", args)
+
+    # Ensure remote directory exists before running command
+    ensure_remote_dir_exists(config)
+
+    run_ssh_command(config, command, cwd=cwd)
+
+
+def exec_command(config: Dict[str, str], args: List[str]) -> None:
+    """runpod exec [--cwd DIR] 'command'
+
+    Push, then run, in one invocation. The push creates remote_dir, so unlike
+    run there is no separate mkdir round trip.
+    """
+    cwd, command = parse_run_args("exec", args)
+    push_command(config, [])
+    print()
+    run_ssh_command(config, command, cwd=cwd)
+
+
+# Commands that need the config, called as handler(config, config_file, args)
+COMMANDS = {
+    # Interactive SSH session
+    None: lambda config, config_file, args: run_ssh_command(config, ""),
+    "config": lambda config, config_file, args: show_config(config, config_file),
+    "status": lambda config, config_file, args: show_status(config),
+    "mount": lambda config, config_file, args: mount_directory(
+        config, args[0] if args else None
+    ),
+    "push": lambda config, config_file, args: push_command(config, args),
+    "pull": lambda config, config_file, args: pull_command(config, args),
+    "run": lambda config, config_file, args: run_command(config, args),
+    "exec": lambda config, config_file, args: exec_command(config, args),
+    # Interactive Python REPL on remote server (needs TTY)
+    "python": lambda config, config_file, args: run_ssh_command(
+        config, "python3", force_tty=True
+    ),
+}
+
+
 def main():
     """Main entry point."""
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    args = sys.argv[2:]
+
+    # Commands that work without a config
+    if command in ("help", "--help", "-h"):
+        show_help()
+        return
+    if command == "unmount":
+        unmount_directory(args[0] if args else None)
+        return
+
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}")
+        show_help()
+        sys.exit(1)
+
     # Find and load configuration for SSH commands
     config_file = find_config()
     if not config_file:
-        print("❌ No .runpod_config.json found in git repository root")
+        print("❌ No .runpod_config.json found in current directory or git repository root")
         print()
         show_help()
         sys.exit(1)
 
     config = load_config(config_file)
-
-    # Parse command line arguments
-    if len(sys.argv) == 1:
-        # Interactive SSH session
-        run_ssh_command(config, "")
-    elif sys.argv[1] == "config":
-        show_config(config, config_file)
-    elif sys.argv[1] == "status":
-        show_status(config)
-    elif sys.argv[1] == "help" or sys.argv[1] == "--help" or sys.argv[1] == "-h":
-        show_help()
-    elif sys.argv[1] == "mount":
-        mount_point = sys.argv[2] if len(sys.argv) > 2 else None
-        mount_directory(config, mount_point)
-    elif sys.argv[1] == "unmount":
-        mount_point = sys.argv[2] if len(sys.argv) > 2 else None
-        unmount_directory(mount_point)
-    elif sys.argv[1] == "push":
-        # Default to git repo root if no source specified
-        if len(sys.argv) > 2:
-            source_dir = sys.argv[2]
-        else:
-            try:
-                # Find git repository root
-                result = subprocess.run(
-                    ["git", "rev-parse", "--show-toplevel"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                source_dir = result.stdout.strip()
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                # Not in a git repo, fall back to current directory
-                source_dir = "."
-
-        # Quote command line dest_dir for consistency with config values
-        dest_dir = (
-            shlex.quote(sys.argv[3]) if len(sys.argv) > 3 else config["remote_dir"]
-        )
-        # Ensure remote directory exists before pushing
-        ensure_remote_dir_exists(config)
-        push_directory(config, source_dir, dest_dir)
-    elif sys.argv[1] == "pull":
-        source_dir = (
-            shlex.quote(sys.argv[2]) if len(sys.argv) > 2 else config["remote_dir"]
-        )
-
-        # Default to git repo root if no dest specified
-        if len(sys.argv) > 3:
-            dest_dir = sys.argv[3]
-        else:
-            try:
-                # Find git repository root
-                result = subprocess.run(
-                    ["git", "rev-parse", "--show-toplevel"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                dest_dir = result.stdout.strip()
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                # Not in a git repo, fall back to current directory
-                dest_dir = "."
-
-        pull_directory(config, source_dir, dest_dir)
-    elif sys.argv[1] == "run":
-        if len(sys.argv) < 3:
-            print("Usage: runpod run [--cwd DIR] 'command to execute'")
-            sys.exit(1)
-
-        # Parse optional --cwd flag
-        cwd = None
-        command_start_idx = 2
-
-        if sys.argv[2] == "--cwd":
-            if len(sys.argv) < 5:
-                print("Usage: runpod run --cwd DIR 'command to execute'")
-                sys.exit(1)
-            cwd = sys.argv[3]
-            command_start_idx = 4
-
-        # Ensure remote directory exists before running command
-        ensure_remote_dir_exists(config)
-
-        # Intentionally allow arbitrary command execution on remote server
-        # This is the core feature - let Claude/user run whatever they want
-        command = " ".join(sys.argv[command_start_idx:])
-        run_ssh_command(config, command, cwd=cwd)
-    elif sys.argv[1] == "python":
-        # Interactive Python REPL on remote server (needs TTY)
-        run_ssh_command(config, "python3", force_tty=True)
-    else:
-        print(f"❌ Unknown command: {sys.argv[1]}")
-        show_help()
-        sys.exit(1)
+    COMMANDS[command](config, config_file, args)
 
 
 if __name__ == "__main__":